@@ -15,8 +15,6 @@ __version__ = "1.3.1" #Major.Minor.Patch
 
 import logging
 
-from copyParmsToOtherNode.gui.UI import CopyParmsUI
-
 #Errors go to error output, rest go to standard output
 logging.basicConfig(format=f"%(levelname)s: [Copy Parms to Other Node] %(message)s")
 #Logger for this module
@@ -25,3 +23,18 @@ logger = logging.getLogger("copyParmsToOtherNode")
 #logger.setLevel(logging.DEBUG)
 #On code release, switch from DEBUG to INFO
 logger.setLevel(logging.INFO)
+
+
+
+def __getattr__(name: str):
+    """
+    Lazily import the UI on first access (PEP 562), so importing the package or the core copy
+    function doesn't pull in Qt and hou.qt.
+
+    :param name: Name of the attribute being accessed on the package.
+    :return: The requested attribute.
+    """
+    if name == "CopyParmsUI":
+        from copyParmsToOtherNode.gui.UI import CopyParmsUI
+        return CopyParmsUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
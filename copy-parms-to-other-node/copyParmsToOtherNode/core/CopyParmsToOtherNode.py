@@ -2,29 +2,151 @@
 
 import hou
 import logging
-from typing import Generator, Tuple
+from typing import Dict, Generator, Set, Tuple
 
 
 
 logger = logging.getLogger(f"copyParmsToOtherNode.{__name__}")
 
+#Node events after which a node's cached parm template group no longer matches the node
+_PTG_NODE_EVENTS = (hou.nodeEventType.SpareParmTemplatesChanged, hou.nodeEventType.BeingDeleted)
+#Asset events that can change the parm interface of any node of an HDA type
+_PTG_HDA_EVENTS = (
+    hou.hdaEventType.AssetSaved,
+    hou.hdaEventType.AssetDeleted,
+    hou.hdaEventType.LibraryInstalled,
+    hou.hdaEventType.LibraryUninstalled
+)
+
+#Parm template groups keyed by node session id, so repeated copies from the same node don't re-fetch its whole
+#interface. Entries are dropped by the event callbacks when the interface may have changed, and after the
+#destination's interface is replaced.
+_ptg_cache: Dict[int, hou.ParmTemplateGroup] = {}
+#(name, label) indices of the cached parm template groups, only built when a label filter is used
+_ptg_label_index_cache: Dict[int, Dict[Tuple[str, str], hou.ParmTemplate]] = {}
+#Session ids of nodes the invalidation callback has been added to
+_ptg_callback_node_ids: Set[int] = set()
+_ptg_hda_callback_registered = False
+
 
 
 def _walk_parm_templates(
-    entries : Tuple[hou.ParmTemplate, ...]
+    entries : Tuple[hou.ParmTemplate, ...],
+    _isinstance=isinstance,
+    _folder_parm_template=hou.FolderParmTemplate
     #Generator type hint formatting: Generator[yield_type, send_type, return_type]
 ) -> Generator[hou.ParmTemplate, None, None]:
     """
-    Recursively yield all parm templates (including nested inside folders).
+    Yield all parm templates (including nested inside folders) in depth-first order.
+
+    Uses an explicit stack of iterators instead of recursive generators, so descending into a folder
+    pushes an iterator rather than allocating a new generator frame per nesting level.
     
     :param entries: Tuple of hou.ParmTemplate
+    :param _isinstance: Not to be passed; binds isinstance as a local for the loop.
+    :param _folder_parm_template: Not to be passed; binds hou.FolderParmTemplate as a local for the loop.
     """
-    for template in entries:
+    stack = [iter(entries)]
+    #Bind the per-template lookups to locals instead of resolving globals/attributes every iteration
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        template = next(stack[-1], None)
+        if template is None:
+            #Current folder is exhausted, go back up to its parent
+            pop()
+            continue
         yield template
-        if isinstance(template, hou.FolderParmTemplate):
-            # Recurse into subfolder contents
-            for child in _walk_parm_templates(template.parmTemplates()):
-                yield child
+        if _isinstance(template, _folder_parm_template):
+            # Descend into subfolder contents
+            push(iter(template.parmTemplates()))
+
+def _index_parm_templates(
+    entries : Tuple[hou.ParmTemplate, ...]
+) -> Dict[Tuple[str, str], hou.ParmTemplate]:
+    """
+    Walk all parm templates once and index them by (name, label). Only the first template seen for a
+    key is kept, matching the first-match behaviour of a linear search.
+
+    :param entries: Tuple of hou.ParmTemplate
+    :return: Dict of {(name, label): template}
+    """
+    by_name_label = {}
+    for template in _walk_parm_templates(entries):
+        by_name_label.setdefault((template.name(), template.label()), template)
+    return by_name_label
+
+def _on_node_parm_templates_changed(node: hou.Node, event_type: hou.nodeEventType, **kwargs) -> None:
+    """
+    Node event callback that drops the node's cached parm template group.
+
+    :param node: The node the event was raised on.
+    :param event_type: The hou.nodeEventType that was raised.
+    :return: Void
+    """
+    _invalidate_parm_template_group(node)
+    if event_type == hou.nodeEventType.BeingDeleted:
+        _ptg_callback_node_ids.discard(node.sessionId())
+
+def _on_hda_changed(**kwargs) -> None:
+    """
+    Asset event callback that drops all cached parm template groups, as any cached node may be an
+    instance of the changed asset.
+
+    :return: Void
+    """
+    _ptg_cache.clear()
+    _ptg_label_index_cache.clear()
+
+def _cached_parm_template_group(node: hou.Node) -> hou.ParmTemplateGroup:
+    """
+    Return the node's parm template group, only fetching it if it isn't cached yet.
+
+    :param node: The node to get the parm template group of.
+    :return: The node's hou.ParmTemplateGroup.
+    """
+    global _ptg_hda_callback_registered
+
+    key = node.sessionId()
+    ptg = _ptg_cache.get(key)
+    if ptg is not None:
+        return ptg
+
+    if not _ptg_hda_callback_registered:
+        hou.hda.addEventCallback(_PTG_HDA_EVENTS, _on_hda_changed)
+        _ptg_hda_callback_registered = True
+    if key not in _ptg_callback_node_ids:
+        node.addEventCallback(_PTG_NODE_EVENTS, _on_node_parm_templates_changed)
+        _ptg_callback_node_ids.add(key)
+
+    ptg = node.parmTemplateGroup()
+    _ptg_cache[key] = ptg
+    return ptg
+
+def _cached_label_index(node: hou.Node) -> Dict[Tuple[str, str], hou.ParmTemplate]:
+    """
+    Return the (name, label) index of the node's cached parm template group, building it on first use.
+
+    :param node: The node to get the index of.
+    :return: Dict of {(name, label): template}
+    """
+    key = node.sessionId()
+    by_name_label = _ptg_label_index_cache.get(key)
+    if by_name_label is None:
+        by_name_label = _index_parm_templates(_cached_parm_template_group(node).entries())
+        _ptg_label_index_cache[key] = by_name_label
+    return by_name_label
+
+def _invalidate_parm_template_group(node: hou.Node) -> None:
+    """
+    Drop the node's cached parm template group so the next lookup re-fetches it.
+
+    :param node: The node whose cached parm template group is stale.
+    :return: Void
+    """
+    key = node.sessionId()
+    _ptg_cache.pop(key, None)
+    _ptg_label_index_cache.pop(key, None)
 
 def _copy_parms_to_other_node(
     src_node_name: str,
@@ -51,72 +173,69 @@ def _copy_parms_to_other_node(
     dst_node = hou.node(dst_node_name)
 
     # Get parameter templates (interface definitions)
-    src_ptg = src_node.parmTemplateGroup()
-    dst_ptg = dst_node.parmTemplateGroup()
+    src_ptg = _cached_parm_template_group(src_node)
     
-    src_all_parm_templates = list(_walk_parm_templates(src_ptg.entries()))
-    
-    # Find the source parm
-    src_parm = None
-    for template in src_all_parm_templates:
-        if template.name() != src_name:
-            continue
-        if src_label is not None and template.label() != src_label:
-            continue
-
-        src_parm = template
-        break
+    # Find the source parm - find() searches nested folders on the HDK side
+    src_parm = src_ptg.find(src_name)
+    if src_parm is not None and src_label is not None and src_parm.label() != src_label:
+        #The label has to disambiguate templates sharing a name, try the HDK's folder-by-label lookup first
+        src_parm = src_ptg.findFolder(src_label)
+        if src_parm is None or src_parm.name() != src_name:
+            #Only walk the templates in Python when that isn't the folder being looked for
+            src_parm = _cached_label_index(src_node).get((src_name, src_label))
     
     if src_parm is None:
         logger.error(
-            (
-                "Folder/parm of name {f_name} and label {f_label} not found in source "
-                "node's parameters."
-            ).format(f_name=src_name, f_label=src_label))
+            "Folder/parm of name %s and label %s not found in source node's parameters.",
+            src_name,
+            src_label
+        )
+        return
 
     dst_name = src_parm.name()
     dst_label = src_parm.label()
 
-    dst_all_parm_templates = list(_walk_parm_templates(dst_ptg.entries()))
-
-    parm_to_remove = next(
-        (parm for parm in dst_all_parm_templates if parm.name() == dst_name),
-        None
-    ) #Returns the first match, otherwise returns None
-
-    if parm_to_remove is not None:
-        logger.debug(parm_to_remove)
-        dst_ptg.remove(parm_to_remove)
-        logger.warning("Existing parameter/folder has been replaced with copied parameter/folder.")
-
-
-    if isinstance(src_parm, hou.FolderParmTemplate):
-        # Copy the folder and all its child parameters
-        new_folder = hou.FolderParmTemplate(dst_name,
-                                            dst_label,
-                                            folder_type=hou.folderType.Tabs)
-
-        for parm in src_parm.parmTemplates():
-            new_folder.addParmTemplate(parm)
-
-        # Append the new folder to the destination parameter interface
-        dst_ptg.append(new_folder)
-    else:
-        #Copy the single parameter
-        dst_ptg.append(src_parm)
-
-    # Apply the modified parameter interface to the destination node
-    try:
-        dst_node.setParmTemplateGroup(dst_ptg)
-    except hou.OperationFailed as error:
-        logger.error(
-            (
-                "Failed to copy - one or more parameters likely already exist with "
-                "conflicting names. Houdini error: {f_error}"
-            ).format(f_error=error)
-        )
-    else:
-        logger.info(
-            (
-                "Successfully copied parameter/folder {f_label} from source to destination."
-            ).format(f_label=dst_label))
+    #Only fetched once the source parm is known to exist
+    dst_ptg = _cached_parm_template_group(dst_node)
+
+    #Returns the first match, otherwise returns None
+    parm_to_remove = dst_ptg.find(dst_name)
+
+    #Group the interface edit into a single named undo entry, so Houdini batches its bookkeeping and
+    #notifications for the whole copy
+    with hou.undos.group("Copy Parm(s) to Other Node"):
+        try:
+            if parm_to_remove is not None:
+                logger.debug("%s", parm_to_remove)
+                dst_ptg.remove(parm_to_remove)
+                logger.warning("Existing parameter/folder has been replaced with copied parameter/folder.")
+
+            if isinstance(src_parm, hou.FolderParmTemplate):
+                # Copy the folder and all its child parameters in one call, rather than adding each child
+                new_folder = hou.FolderParmTemplate(dst_name,
+                                                    dst_label,
+                                                    parm_templates=src_parm.parmTemplates(),
+                                                    folder_type=hou.folderType.Tabs)
+
+                # Append the new folder to the destination parameter interface
+                dst_ptg.append(new_folder)
+            else:
+                #Copy the single parameter
+                dst_ptg.append(src_parm)
+
+            # Apply the modified parameter interface to the destination node
+            try:
+                dst_node.setParmTemplateGroup(dst_ptg)
+            except hou.OperationFailed as error:
+                logger.error(
+                    (
+                        "Failed to copy - one or more parameters likely already exist with "
+                        "conflicting names. Houdini error: %s"
+                    ),
+                    error
+                )
+            else:
+                logger.info("Successfully copied parameter/folder %s from source to destination.", dst_label)
+        finally:
+            #The cached group is modified in place above, so however this ends it no longer matches the node
+            _invalidate_parm_template_group(dst_node)
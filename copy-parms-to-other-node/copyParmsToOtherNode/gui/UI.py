@@ -5,6 +5,7 @@ Some code/logic from: https://github.com/fredrikaverpil/pyvfx-boilerplate/blob/m
 TODO: Make a method _create_connections (see Mauricio's example) to create connections separately from building the UI
 """
 
+import functools
 import logging
 import hou
 from ..core.CopyParmsToOtherNode import _copy_parms_to_other_node as CopyParmsToOtherNode
@@ -66,6 +67,9 @@ class CopyParmsUI(QtWidgets.QMainWindow):
 
         :return: Void
         """
+        #Don't repaint/relayout for every widget added, only once the UI is fully built
+        self.setUpdatesEnabled(False)
+
         central = QtWidgets.QWidget()
         self.setCentralWidget(central)
 
@@ -135,6 +139,8 @@ class CopyParmsUI(QtWidgets.QMainWindow):
         #Spacer at bottom
         main_layout.addStretch()
 
+        self.setUpdatesEnabled(True)
+
     def _add_node_input_to_grid_layout(
             self,
             input_field: hou.qt.InputField,
@@ -171,11 +177,9 @@ class CopyParmsUI(QtWidgets.QMainWindow):
             QtWidgets.QSizePolicy.Fixed
         )
 
+        #partial binds the input field without creating a closure per row; the node is passed through
         node_chooser.nodeSelected.connect(
-            lambda node: self._set_input_field_from_node_chooser(
-                node=node,
-                input_field=input_field
-            )
+            functools.partial(self._set_input_field_from_node_chooser, input_field=input_field)
         )
 
         layout.addWidget(node_chooser, layout_row, 2)
@@ -233,10 +237,8 @@ class CopyParmsUI(QtWidgets.QMainWindow):
         src_name = self.input_source_name.value(0)
         src_label = self.input_source_label.value(0)
         dst_node_name = self.input_destination_node.value(0)
-        if src_label:
-            CopyParmsToOtherNode(src_node_name, dst_node_name, src_name, src_label)
-        else:
-            CopyParmsToOtherNode(src_node_name, dst_node_name, src_name)
+        #An empty label field means no label filter
+        CopyParmsToOtherNode(src_node_name, dst_node_name, src_name, src_label or None)
 
 
     def display(self) -> None:
@@ -7,7 +7,7 @@ Based off of the algorithm outlined in Remark 4.23 "Computational Optimal Transp
 & Marco Cuturi https://arxiv.org/abs/1803.00567
 
 Heavily commented in the form of notes/documentation for myself as I was learning this.
-Updated 11/2/2025
+Updated 10/15/2026
 
 Place in a python SOP, and create the required parameters on the SOP:
 "epsilon" : float (Hard min: 1e-10; Soft Max: 0.2; Default: 0.03)
@@ -22,21 +22,12 @@ SOP in Houdini 20.5.
 Plug in the source point cloud in the Python SOP's first input, and the target point cloud in the Python SOP's second
 input.
 
-Outputs the attribute ot_flat_pos_array on the source points, which is a flattened list of the positions of each point
-after optimal transport.
-A point wrangle after the Python SOP can convert this to a per-point vector attribute with the following code:
-    float ot_flat_pos_array[];
-    ot_flat_pos_array = detail(0, "ot_flat_pos_array");
-
-    vector ot_pos;
-
-    int index = @ptnum * 3;
-
-    ot_pos.x = ot_flat_pos_array[index];
-    ot_pos.y = ot_flat_pos_array[index+1];
-    ot_pos.z = ot_flat_pos_array[index+2];
-
-    v@ot_pos = ot_pos;
+Outputs the vector point attribute ot_pos on the source points, which is the position of each point after optimal
+transport. It is written for all points at once from the raw float32 bytes, so no point wrangle is needed to unpack a
+detail array (ot_flat_pos_array) as in earlier versions.
+Upgrading from 1.x: delete the point wrangle that unpacked ot_flat_pos_array. The detail array isn't written anymore,
+so the wrangle would read an empty array and overwrite ot_pos with zeros. The HDA embeds its own copy of the script and
+is unaffected.
 
 This gets quite slow, try to limit yourself to a few thousand points if computed each step in a solver, and less than a
 hundred thousand if computed once, otherwise it gets quite slow. Be wary of memory as well for large point clouds.
@@ -47,7 +38,7 @@ https://github.com/conlen-b/cb-houdini-tools/blob/main/sinkhorn-based-log-domain
 
 __author__ = "Conlen Breheny"
 __copyright__ = "Copyright 2025, Conlen Breheny"
-__version__ = "1.0.3" #Major.Minor.Patch
+__version__ = "2.0.0" #Major.Minor.Patch
 
 import numpy as np
 from typing import Optional, Tuple, Dict
@@ -56,7 +47,10 @@ import gc #Python Garbage Collector to free memory explicitly
 
 def _logsumexp(
     a: np.ndarray,
-    axis: Optional[int] = None
+    axis: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    work: Optional[np.ndarray] = None,
+    a_max: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Numpy-only implementation of scipy.special import logsumexp.
@@ -67,9 +61,24 @@ def _logsumexp(
 
     :param a: np.ndarray of values in natural log (log base e) space.
     :param axis: optional integer specifying the axis along which to sum. If None, sum over all elements.
+    :param out: optional np.ndarray the result is written into, shaped like a with the axis removed.
+    :param work: optional np.ndarray scratch buffer shaped like a. It may be a itself, in which case a is overwritten.
+    :param a_max: optional np.ndarray scratch buffer for the max, shaped like a with the axis kept as size 1.
     :return: np.ndarray with log of summed exponentials along the specified axis.
     """
 
+    """If the caller hands in buffers, every step is written into them instead of allocating new arrays. The Sinkhorn
+    loop calls this twice per iteration on (num_sources, num_targets) matrices, so allocating a full size temporary for
+    each step adds up to a lot of memory traffic over a few hundred iterations."""
+    if out is not None and work is not None and a_max is not None:
+        np.max(a, axis=axis, keepdims=True, out=a_max)
+        np.subtract(a, a_max, out=work)
+        np.exp(work, out=work)
+        np.sum(work, axis=axis, out=out)
+        np.log(out, out=out)
+        out += np.squeeze(a_max, axis=axis)
+        return out
+
     """Find the maximum value along the specified axis that is being summed.
     Exponentiating very large/small numbers can over/underflow, so subtracting the max before then adding it back after
     keeps the numbers in a safe range. Full dimensions are kept for the computation"""
@@ -106,7 +115,7 @@ def _sinkhorn_log_domain_ot(
     :param min_iterations: int, minimum number of Sinkhorn iterations before checking for convergence.
     :param max_iterations: int, maximum number of Sinkhorn iterations to perform.
     :param tolerance: float, early stopping threshold based on marginal error.
-    :param verbose: bool, if True, prints convergence information every ~32 iterations.
+    :param verbose: bool, if True, prints convergence information after 32, 64, 128, ... iterations.
 
     Returns
     -------
@@ -170,13 +179,26 @@ def _sinkhorn_log_domain_ot(
     distance between the source and target points described by the index eg. [src_pt, tgt_pt]"""
 
     """Compute log of kernel: log(K) = -C / ε. The non-log kernel is K = e^(-C/ε), but log of e^(n) results in n, so
-    the log of K results in -C / ε. log_kernel has shape (num_sources, num_targets) and stores log(K_ij) = -C_ij / ε"""
-    log_kernel = -cost_matrix / float(epsilon)
+    the log of K results in -C / ε. log_kernel has shape (num_sources, num_targets) and stores log(K_ij) = -C_ij / ε
+    1 / ε is computed once so each entry is a multiply instead of a division, and the cost matrix isn't needed again so
+    it is scaled in place rather than allocating another (num_sources, num_targets) matrix."""
+    inv_eps = 1.0 / float(epsilon)
+    cost_matrix *= -inv_eps
+    log_kernel = cost_matrix
+    del cost_matrix
 
     # Initialize scaling factors (log_u, log_v)
     log_u = np.zeros(num_sources, dtype=np.float32)
     log_v = np.zeros(num_targets, dtype=np.float32)
 
+    """Preallocate the buffers the loop writes into, so each iteration reuses them instead of allocating new
+    (num_sources, num_targets) temporaries for the scaled kernel and every logsumexp step"""
+    work = np.empty_like(log_kernel)
+    row_max = np.empty((num_sources, 1), dtype=np.float32)
+    col_max = np.empty((1, num_targets), dtype=np.float32)
+    log_kernel_v = np.empty(num_sources, dtype=np.float32)
+    log_kernel_t_u = np.empty(num_targets, dtype=np.float32)
+
     """Convert weights to log domain.
     1e-256 is added to prevent taking the logarithm of zero which is negative infinity or an error. 1e-256 is chosen to
     be safely above underflow for double precision, but small enough not to affect the computation significantly."""
@@ -188,6 +210,7 @@ def _sinkhorn_log_domain_ot(
     terminate. The error checks for convergence, or when the error is less than the tolerance."""
     previous_error = np.inf
     converge_type = ""
+    next_check = 32 #Iteration count of the next intermediate convergence check
 
     """
     Sinkhorn iterative updates - converge towards the u and v scaling factors that balance out the K matrix so that the
@@ -222,23 +245,36 @@ def _sinkhorn_log_domain_ot(
         In the first pass, log_v is 1 everywhere, so this is the assumption that the algorithm starts with and it
         converges as more iterations are ran.
         """
-        log_kernel_v = _logsumexp(log_kernel + log_v[None, :], axis=1)
-        log_u = log_src_wgts - log_kernel_v #Update log_u so that the rows of the scaled kernel sum to the source weight
-
-        # Update target scaling (v)
-        log_kernel_t_u = _logsumexp((log_kernel + log_u[:, None]).T, axis=1)
+        np.add(log_kernel, log_v[None, :], out=work)
+        _logsumexp(work, axis=1, out=log_kernel_v, work=work, a_max=row_max)
+        #Update log_u so that the rows of the scaled kernel sum to the source weight
+        np.subtract(log_src_wgts, log_kernel_v, out=log_u)
+
+        """Update target scaling (v). Reducing along axis 0 sums each column directly, rather than transposing and
+        summing the rows, which would copy the whole (num_sources, num_targets) matrix every iteration."""
+        np.add(log_kernel, log_u[:, None], out=work)
+        _logsumexp(work, axis=0, out=log_kernel_t_u, work=work, a_max=col_max)
         #Update log_v so that the columns of the scaled kernel sum to the target weight
-        log_v = log_tgt_wgts - log_kernel_t_u
-
-        """Check convergence every ~32 iterations (or final). & 31 is equal to % 32, it is a bitwise operation that runs
-        faster than modulo since it is 32 so it is an optimization."""
-        if (iteration & 31) == 0 or iteration == max_iterations - 1:
-            """Add the scaling factors to the kernel and sum the columns (targets), to next check if we have converged
-            on the target weights"""
-            log_col_sums = _logsumexp(log_u[:, None] + log_kernel + log_v[None, :], axis=0)
-            """Compute how close the columns (targets) of the scaled kernel are to the target weights.
-            Currently, target weights (columns) is all that is checked for convergence, not source weights."""
-            marginal_error = np.max(np.abs(np.exp(log_col_sums) - tgt_wgts))
+        np.subtract(log_tgt_wgts, log_kernel_t_u, out=log_v)
+
+        """Check convergence after geometrically spaced iteration counts (32, 64, 128, ...) and after the final iteration.
+        Each check is another full pass over the (num_sources, num_targets) kernel, and once Sinkhorn has settled the
+        error barely moves between nearby checks, so spacing them out mostly saves checks that wouldn't have stopped
+        it. A check before min_iterations can't stop the loop, so it is skipped unless verbose."""
+        check_convergence = iteration == max_iterations - 1
+        if iteration + 1 == next_check:
+            next_check *= 2
+            check_convergence = check_convergence or verbose or iteration >= min_iterations
+
+        if check_convergence:
+            """Add the scaling factors to the kernel and sum the rows (sources), to next check if we have converged on
+            the source weights. The columns can't be used for this: log_v was just set so that the columns sum to the
+            target weights, so their error is only ever rounding noise. The rows only match the source weights once
+            log_v has stopped changing. log_kernel_v is recomputed for the current log_v first."""
+            np.add(log_kernel, log_v[None, :], out=work)
+            _logsumexp(work, axis=1, out=log_kernel_v, work=work, a_max=row_max)
+            #Compute how close the rows (sources) of the scaled kernel are to the source weights
+            marginal_error = np.max(np.abs(np.exp(log_u + log_kernel_v) - src_wgts))
 
             if verbose:
                 #:4d prints an integer with minimum 4 digits, so space padding is added to <4 digit integers
@@ -266,14 +302,20 @@ def _sinkhorn_log_domain_ot(
         else:
             converge_type = "Max iterations reached"
 
-    #Compute final transport matrix after convergence: P = exp(log_u + logK + log_v)
-    log_transport = log_u[:, None] + log_kernel + log_v[None, :] #Add computed scaling values to kernel
-    transport_matrix = np.exp(log_transport) #Convert from natural log to linear
-
-    """The weights were normalized to sum to 1 before Sinkhorn. Due to floating point precision, it may now sum slightly
+    """Compute final transport matrix after convergence: P = exp(log_u + logK + log_v)
+    The weights were normalized to sum to 1 before Sinkhorn. Due to floating point precision, it may now sum slightly
     less or more than 1. This normalization makes it sum exactly to 1 based on the source weights so that each source
-    distributes 100% of its mass."""
-    transport_matrix /= (transport_matrix.sum(axis=1)[:, None] + 1e-300)
+    distributes 100% of its mass.
+    The normalization is done in log space before the only exp, by subtracting each row's logsumexp, rather than
+    dividing by the row sums afterwards: the exp can't overflow, no 1e-300 guard is needed, and the exp writes over
+    log_transport instead of allocating another (num_sources, num_targets) matrix. log_u[i] is the same for a whole row,
+    so it cancels out in the normalization and isn't added at all.
+    The kernel isn't needed after this, so the scaling values are added to it in place, and the loop's work buffers
+    hold the logsumexp intermediates."""
+    log_kernel += log_v[None, :] #Add computed scaling values to kernel
+    log_transport = log_kernel
+    log_transport -= _logsumexp(log_transport, axis=1, out=log_kernel_v, work=work, a_max=row_max)[:, None]
+    transport_matrix = np.exp(log_transport, out=log_transport) #Convert from natural log to linear
 
     """Applying the transport matrix to the target points results in the optimally transported/mapped source point
     positions.
@@ -310,10 +352,12 @@ def _zspc_sbld_optimal_transport():
     tolerance_parm_value = node.parm("tolerance").eval()
     output_debug_attrs = node.parm("output_debug_attrs").eval()
 
-    # get source points A (e.g. previous-frame webbing points for WDAS Druun setup)
-    src_pts = np.array([p.position() for p in geo.points()], dtype=np.float32)
+    """get source points A (e.g. previous-frame webbing points for WDAS Druun setup)
+    Read every position in one call as the raw float32 bytes of P, rather than calling position() per point.
+    np.frombuffer views the bytes without copying, and reshape makes it one row per point."""
+    src_pts = np.frombuffer(geo.pointFloatAttribValuesAsString("P"), dtype=np.float32).reshape(-1, 3)
 
-    tgt_pts = np.array([p.position() for p in geo_1.points()], dtype=np.float32)
+    tgt_pts = np.frombuffer(geo_1.pointFloatAttribValuesAsString("P"), dtype=np.float32).reshape(-1, 3)
 
     """optional weights - None results in uniform weights, otherwise pass in an array of weights
     (eg. read from an attribute)"""
@@ -335,19 +379,17 @@ def _zspc_sbld_optimal_transport():
     #Explicitly free memory
     gc.collect()
 
-    #Construct flat array of floats for Houdini as Python detail vector arrays not supported in Houdini 20.5.
-    transported_src_pts_flat = transported_src_pts.flatten().tolist()
+    """Write all positions to the ot_pos point attribute in one call from their raw float32 bytes, the counterpart of
+    reading P above. Avoids calling setAttribValue per point as well as building a list of Python floats."""
+    if geo.findPointAttrib("ot_pos") is None:
+        geo.addAttrib(hou.attribType.Point, "ot_pos", (0.0, 0.0, 0.0), create_local_variable=False)
+    geo.setPointFloatAttribValuesFromString("ot_pos", transported_src_pts.astype(np.float32, copy=False).tobytes())
 
     #Free up memory by allowing the Python "garbage collector" to see these
     del transported_src_pts
     #Explicitly free memory
     gc.collect()
 
-    #Write to detail array attribute instead of point attribute to avoid for each loop API calls -- optimization.
-    if geo.findGlobalAttrib("ot_flat_pos_array") is None:
-        geo.addArrayAttrib(hou.attribType.Global, "ot_flat_pos_array", hou.attribData.Float)
-    geo.setGlobalAttribValue("ot_flat_pos_array", transported_src_pts_flat)
-
     #Output iterations and converge type if output debug attrs is true
     if output_debug_attrs:
         if geo.findGlobalAttrib("_ot_iterations") is None: